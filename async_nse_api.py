@@ -0,0 +1,279 @@
+import asyncio
+from urllib.parse import quote
+
+import httpx
+
+from nse_api import (
+    HEADERS,
+    TIMEOUT,
+    RETRY_STATUSES,
+    RETRY_ERRORS,
+    RETRIES,
+    BACKOFF_FACTOR,
+    COOKIE_URL,
+    INDICES_URL,
+    QUOTE_URL,
+    HISTORICAL_URL,
+    HISTORICAL_TIMEOUT,
+    HISTORICAL_CACHE_DIR,
+    METADATA_TTL,
+    _json_loads,
+    _index_url,
+    _MetadataCacheMixin,
+    _parse_indices,
+    _parse_all_stocks,
+    _parse_index_data,
+    _parse_index_dataframe,
+    _parse_stock_data,
+    _parse_historical_data,
+    _finish_historical_data,
+    _historical_cache_path,
+    _read_historical_cache,
+    _write_historical_cache,
+)
+
+
+class AsyncNseAPI(_MetadataCacheMixin):
+    """
+    asyncio counterpart of NseAPI, backed by a single HTTP/2 httpx.AsyncClient.
+
+    Use it as an async context manager so the client is opened, primed with NSE cookies and closed:
+
+        async with AsyncNseAPI() as api:
+            quotes = await asyncio.gather(*[api.get_stock_data(s) for s in symbols])
+
+    transport replaces the default HTTP/2 httpx.AsyncHTTPTransport, e.g. with an httpx.MockTransport in tests.
+    """
+
+    def __init__(
+        self, max_concurrency: int = 16, cache_dir=HISTORICAL_CACHE_DIR, metadata_ttl=METADATA_TTL, transport=None
+    ) -> None:
+        self.HEADERS = dict(HEADERS)
+        self.transport = transport
+        self.cache_dir = cache_dir
+        self.metadata_ttl = metadata_ttl
+        self._metadata_cache = {}
+
+        self.client = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._cookie_lock = asyncio.Lock()
+        self._cookie_generation = 0
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            headers=self.HEADERS,
+            timeout=TIMEOUT,
+            follow_redirects=True,
+            transport=self.transport or httpx.AsyncHTTPTransport(http2=True, retries=RETRIES),
+        )
+        await self._send(COOKIE_URL)
+
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.client.aclose()
+        self.client = None
+
+    async def _send(self, url, **kwargs):
+        # Retry rate-limited, failed and dropped requests with exponential backoff, returning the last response.
+        for attempt in range(RETRIES + 1):
+            try:
+                async with self._semaphore:
+                    response = await self.client.get(url, **kwargs)
+            except RETRY_ERRORS:
+                if attempt == RETRIES:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == RETRIES:
+                    return response
+
+            await asyncio.sleep(BACKOFF_FACTOR * 2 ** attempt)
+
+    async def _prime_cookies(self, generation):
+        async with self._cookie_lock:
+            if self._cookie_generation == generation:
+                await self._send(COOKIE_URL)
+                self._cookie_generation += 1
+
+    async def _get(self, url, **kwargs):
+        # NSE rejects API calls once its session cookies expire; refresh them when a request is refused.
+        generation = self._cookie_generation
+        response = await self._send(url, **kwargs)
+
+        if response.status_code in (401, 403):
+            await self._prime_cookies(generation)
+            response = await self._send(url, **kwargs)
+
+        return response.status_code, response.content
+
+    async def get_indices(self):
+        """
+        Get the indices from the NSE India API.
+
+        The result is cached in memory for metadata_ttl seconds.
+
+        Returns:
+            A list of indices.
+
+            None: If the data cannot be retrieved.
+        """
+        cached = self._cache_get("indices")
+
+        if cached is not None:
+            return cached
+
+        status, body = await self._get(INDICES_URL)
+
+        if status != 200:
+            return None
+
+        return self._cache_set("indices", _parse_indices(_json_loads(body)))
+
+    async def get_all_stocks(self, index: str):
+        """
+        Retrieves all stocks from the NSE equity-stockIndices API based on the given index.
+
+        The result is cached in memory for metadata_ttl seconds.
+
+        Args:
+            index (str): The index for which to retrieve the stocks.
+
+        Returns:
+            list: A list of dictionaries containing the stock symbol and company name of each stock.
+
+            None: If the data cannot be retrieved.
+        """
+        key = ("all_stocks", index.upper())
+        cached = self._cache_get(key)
+
+        if cached is not None:
+            return cached
+
+        status, body = await self._get(_index_url(index))
+
+        if status != 200:
+            return None
+
+        return self._cache_set(key, _parse_all_stocks(_json_loads(body), index))
+
+    async def index_data(self, stock_index):
+        """
+        Indexes data for a given stock index. See NseAPI.index_data for the keys of each dictionary.
+
+        Args:
+            stock_index (str): The stock index to index data for.
+
+        Returns:
+            List[Dict[str, Union[str, float]]]: A list of dictionaries containing the indexed data.
+
+            None: If the response status code is not 200.
+        """
+        status, body = await self._get(_index_url(stock_index))
+
+        if status != 200:
+            return None
+
+        return _parse_index_data(_json_loads(body), stock_index)
+
+    async def index_dataframe(self, stock_index):
+        """
+        Same as index_data, but returns the data as a pandas DataFrame. See NseAPI.index_dataframe.
+
+        Args:
+            stock_index (str): The stock index to index data for.
+
+        Returns:
+            pandas.DataFrame: One row per record of the index.
+
+            None: If the response status code is not 200.
+        """
+        status, body = await self._get(_index_url(stock_index))
+
+        if status != 200:
+            return None
+
+        return _parse_index_dataframe(_json_loads(body), stock_index)
+
+    async def snapshot(self, index):
+        """
+        Retrieves a quote for every constituent of an index with a single request. See NseAPI.snapshot.
+
+        Args:
+            index (str): The stock index to take the snapshot of.
+
+        Returns:
+            dict: A dictionary mapping the symbol of each constituent to its index_data record. The record of the
+            index itself is left out.
+
+            None: If the data cannot be retrieved.
+        """
+        data = await self.index_data(index)
+
+        if data is None:
+            return None
+
+        index_symbol = index.upper()
+
+        return {row['symbol']: row for row in data if row['symbol'] != index_symbol}
+
+    async def get_stock_data(self, symbol):
+        """
+        Retrieves stock data for a given symbol. See NseAPI.get_stock_data for the returned keys.
+
+        Parameters:
+            symbol (str): The symbol of the stock.
+
+        Returns:
+            dict: A dictionary containing various stock data. Returns None if the stock data cannot be retrieved.
+        """
+        status, body = await self._get(QUOTE_URL.format(symbol=symbol))
+
+        if status != 200:
+            return None
+
+        return _parse_stock_data(_json_loads(body))
+
+    async def get_historical_data(self, symbol, start_date, end_date, dtype_backend=None, as_python_date=False):
+        """
+        Retrieves historical data for a given symbol within a specified date range.
+
+        Args:
+            symbol (str): The symbol of the stock.
+            start_date (str): The start date of the historical data in the format "YYYY-MM-DD".
+            end_date (str): The end date of the historical data in the format "YYYY-MM-DD".
+            dtype_backend (str): Passed to DataFrame.convert_dtypes when given, e.g. "pyarrow".
+            as_python_date (bool): Return "DATE" as datetime.date objects instead of datetime64.
+
+        Returns:
+            pandas.DataFrame: The historical data as a pandas DataFrame, with the same columns as
+            NseAPI.get_historical_data. Results are cached in cache_dir like NseAPI does.
+
+        Raises:
+            Exception: If there is an error retrieving the data from the API.
+        """
+        # Parquet I/O and CSV parsing block, so they run in a worker thread to keep the event loop free.
+        if self.cache_dir is not None:
+            cache_path = _historical_cache_path(self.cache_dir, symbol, start_date, end_date)
+            df = await asyncio.to_thread(_read_historical_cache, cache_path, end_date)
+
+            if df is not None:
+                return _finish_historical_data(df, dtype_backend, as_python_date)
+
+        url = HISTORICAL_URL.format(symbol=quote(symbol.upper()), start_date=start_date, end_date=end_date)
+        status, body = await self._get(url, timeout=HISTORICAL_TIMEOUT)
+
+        if status == 200:
+            try:
+                df = await asyncio.to_thread(_parse_historical_data, body, symbol)
+
+            except:
+                raise Exception(f"Error: {_json_loads(body).get('showMessage')}")
+
+            if self.cache_dir is not None:
+                await asyncio.to_thread(_write_historical_cache, df, cache_path)
+
+            return _finish_historical_data(df, dtype_backend, as_python_date)
+
+        else:
+            print(body.decode())
+            return None
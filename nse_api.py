@@ -1,56 +1,458 @@
-import requests
+import hashlib
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from pathlib import Path
+
+import httpx
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
 import pandas as pd
-from io import StringIO
+from io import BytesIO
 
-class NseAPI:
-    def __init__(self) -> None:
-        self.HEADERS = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/93.0.4577.82 Safari/537.36 Edg/93.0.961.52",
-        "X-Requested-With": "XMLHttpRequest"
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    # pandas bundles ujson, which still beats the stdlib decoder, but it only accepts str.
+    try:
+        from pandas.io.json import ujson_loads as _str_loads
+    except ImportError:
+        from json import loads as _str_loads
+
+    def _json_loads(content):
+        return _str_loads(content.decode())
+
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/93.0.4577.82 Safari/537.36 Edg/93.0.961.52",
+    "X-Requested-With": "XMLHttpRequest",
+    "Accept-Encoding": "gzip, deflate, br"
+}
+
+BASE_URL = "https://www.nseindia.com"
+COOKIE_URL = f"{BASE_URL}/market-data/live-equity-market"
+INDICES_URL = f"{BASE_URL}/api/equity-master"
+INDEX_URL = BASE_URL + "/api/equity-stockIndices?index={index}"
+QUOTE_URL = BASE_URL + "/api/quote-equity?symbol={symbol}"
+HISTORICAL_URL = BASE_URL + '/api/historical/cm/equity?symbol={symbol}&series=["EQ"]&from={start_date}&to={end_date}&csv=true'
+
+HISTORICAL_CACHE_DIR = Path.home() / ".nse_cache" / "historical"
+# Bump whenever the cached DataFrame layout changes, so stale files are not read back.
+HISTORICAL_CACHE_VERSION = 2
+CLOSED_WINDOW_TTL = 30 * 24 * 60 * 60
+OPEN_WINDOW_TTL = 60 * 60
+METADATA_TTL = 60 * 60
+POOL_SIZE = 32
+ETAG_CACHE_SIZE = 8
+TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+HISTORICAL_TIMEOUT = 1000
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_ERRORS = (httpx.ReadError, httpx.RemoteProtocolError)
+RETRIES = 3
+BACKOFF_FACTOR = 0.3
+
+
+def _loads(response):
+    return _json_loads(response.content)
+
+
+def _index_url(index):
+    return INDEX_URL.format(index=quote(index.upper()))
+
+
+def _parse_indices(response):
+    return list(itertools.chain.from_iterable(response.values()))
+
+
+def _parse_all_stocks(response, index):
+    index_symbol = index.upper()
+
+    return [
+        {
+            "stock_symbol": stock['symbol'],
+            "company_name": stock.get('meta', {}).get('companyName')
         }
+        for stock in response['data']
+        if stock['symbol'] != index_symbol
+    ]
+
+
+INDEX_DATA_COLUMNS = [
+    'symbol',
+    'open',
+    'dayHigh',
+    'dayLow',
+    'lastPrice',
+    'previousClose',
+    'change',
+    'pChange',
+    'yearHigh',
+    'yearLow',
+    'totalTradedVolume',
+    'totalTradedValue',
+    'perChange365d',
+    'perChange30d',
+]
+INDEX_DATA_RENAMES = {'yearHigh': '52W_High', 'yearLow': '52W_Low'}
+INDEX_DATA_KEYS = [INDEX_DATA_RENAMES.get(column, column) for column in INDEX_DATA_COLUMNS]
+
+
+def _compile_row_builder(columns, keys):
+    # Generate straight-line code for the projection so building a row is a single call with no loop.
+    fields = ", ".join(f"{key!r}: d[{column!r}]" for column, key in zip(columns, keys))
+    source = f"def _build_row(d, ts):\n    return {{{fields}, 'last_updated_at': ts}}\n"
+
+    namespace = {}
+    exec(compile(source, "<nse-mapper>", "exec"), namespace)
+
+    return namespace["_build_row"]
+
+
+_build_index_row = _compile_row_builder(INDEX_DATA_COLUMNS, INDEX_DATA_KEYS)
+
+
+def _parse_index_data(j_response, stock_index):
+    last_updated = j_response['timestamp']
+    index_symbol = stock_index.upper()
+    build_row = _build_index_row
+    result = []
+
+    for datum in j_response['data']:
+        temp_dict = build_row(datum, last_updated)
+
+        # The record for the index itself carries no company name.
+        meta = datum.get('meta')
+        if meta is not None and datum['symbol'] != index_symbol:
+            temp_dict['company_name'] = meta.get("companyName")
+
+        result.append(temp_dict)
+
+    return result
+
+
+def _parse_index_dataframe(j_response, stock_index):
+    data = j_response['data']
+
+    df = pd.DataFrame(data, columns=INDEX_DATA_COLUMNS).rename(columns=INDEX_DATA_RENAMES)
+    df['last_updated_at'] = j_response['timestamp']
+
+    # The record for the index itself carries no company name.
+    company_names = pd.Series([(datum.get('meta') or {}).get('companyName') for datum in data], index=df.index)
+    df['company_name'] = company_names.where(df['symbol'] != stock_index.upper())
+
+    return df
+
+
+def _parse_stock_data(result):
+    info = result.get("info")
+
+    if not info:
+        return None
+
+    metadata = result['metadata']
+    price_info = result['priceInfo']
+    intraday = price_info['intraDayHighLow']
+    week_high_low = price_info['weekHighLow']
+    pre_open_market = result['preOpenMarket']
+
+    return {
+        'symbol': info['symbol'],
+        'company_name': info['companyName'],
+        'industry': info.get('industry'),
+        'listingDate': metadata['listingDate'],
+        'open_price': price_info['open'],
+        'last_price': price_info['lastPrice'],
+        'previous_close': price_info['previousClose'],
+        'high_price': intraday['max'],
+        'low_price': intraday['min'],
+        'change': round(price_info['change'], 2),
+        'pChange': round(price_info['pChange'], 2),
+        '52w_high_date': week_high_low['maxDate'],
+        '52w_high': week_high_low['max'],
+        '52w_low_date': week_high_low['minDate'],
+        '52w_low': week_high_low['min'],
+        'total_traded_volume': pre_open_market['totalTradedVolume'],
+        'total_buy_quantity': pre_open_market['totalBuyQuantity'],
+        'total_sell_quantity': pre_open_market['totalSellQuantity'],
+        'last_update_time': metadata['lastUpdateTime']
+    }
+
+
+HISTORICAL_COLUMNS = [
+    "DATE",
+    "SERIES",
+    "OPEN",
+    "HIGH",
+    "LOW",
+    "PREV_CLOSE",
+    "LTP",
+    "CLOSE",
+    "VWAP",
+    "52W_H",
+    "52W_L",
+    "VOLUME",
+    "VALUE",
+    "NO_OF_TRADES",
+]
+
+
+def _parse_historical_data(content, symbol):
+    df = pd.read_csv(BytesIO(content), thousands=",", names=HISTORICAL_COLUMNS, header=0, engine="c")
+    df.insert(0, "SYMBOL", symbol)
+    df["SYMBOL"] = df["SYMBOL"].astype("category")
+    df["SERIES"] = df["SERIES"].astype("category")
+    df["DATE"] = pd.to_datetime(df["DATE"], format="%d-%b-%Y", cache=True)
+    df['VWAP'] = pd.to_numeric(df['VWAP'], errors='coerce')
+
+    return df
+
+
+def _finish_historical_data(df, dtype_backend, as_python_date):
+    if as_python_date:
+        df["DATE"] = df["DATE"].dt.date
+
+    if dtype_backend is None:
+        return df
+
+    # convert_dtypes turns float columns holding only whole numbers (e.g. whole-rupee prices) into integers, so the
+    # columns that were float are cast back to the backend's float type to keep dtypes independent of the data.
+    float_columns = df.select_dtypes("float").columns
+    float_dtype = "double[pyarrow]" if dtype_backend == "pyarrow" else "Float64"
+
+    df = df.convert_dtypes(dtype_backend=dtype_backend)
+
+    return df.astype({column: float_dtype for column in float_columns})
+
+
+def _parse_date(value):
+    for fmt in ("%d-%m-%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            pass
+
+    return None
+
+
+def _historical_cache_path(cache_dir, symbol, start_date, end_date):
+    key = hashlib.md5(f"{HISTORICAL_CACHE_VERSION}|{symbol}|{start_date}|{end_date}".encode()).hexdigest()
+
+    return Path(cache_dir) / f"{key}.parquet"
+
+
+def _read_historical_cache(path, end_date):
+    end = _parse_date(end_date)
+
+    try:
+        mtime = path.stat().st_mtime
+
+        # Only a file written after the window closed holds final data; one fetched while the window was still
+        # open may be partial, so it keeps the short TTL even once the window has ended.
+        closed = end is not None and date.fromtimestamp(mtime) > end
+        ttl = CLOSED_WINDOW_TTL if closed else OPEN_WINDOW_TTL
+
+        if time.time() - mtime < ttl:
+            return pd.read_parquet(path)
+    except (OSError, ImportError, ValueError):
+        pass
+
+    return None
+
+
+def _write_historical_cache(df, path):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(path, compression="zstd")
+    except (OSError, ImportError, ValueError):
+        pass
+
+
+class _MetadataCacheMixin:
+    """
+    In-memory TTL cache for endpoints whose data changes at most daily. Expects metadata_ttl and
+    _metadata_cache attributes on the instance.
+    """
+
+    def _cache_get(self, key):
+        entry = self._metadata_cache.get(key)
+
+        if entry is not None and time.monotonic() - entry[0] < self.metadata_ttl:
+            return entry[1]
+
+        return None
+
+    def _cache_set(self, key, value):
+        self._metadata_cache[key] = (time.monotonic(), value)
+
+        return value
+
+    def cache_clear(self):
+        """
+        Clears the in-memory cache used by get_indices and get_all_stocks.
+        """
+        self._metadata_cache.clear()
+
+
+class NseAPI(_MetadataCacheMixin):
+    # One cookie-carrying HTTP/2 client is shared by every instance, so creating several NseAPI objects is free.
+    _shared_client = None
+    _client_lock = threading.Lock()
+    # Incremented after every cookie refresh, so threads refused at the same time only refresh once.
+    _cookie_generation = 0
+
+    def __init__(self, max_workers: int = 8, cache_dir=HISTORICAL_CACHE_DIR, metadata_ttl=METADATA_TTL) -> None:
+        self.HEADERS = dict(HEADERS)
+
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
+        self.metadata_ttl = metadata_ttl
+        self._metadata_cache = {}
+        self._etag_cache = OrderedDict()
+        self._etag_lock = threading.Lock()
+
+        with NseAPI._client_lock:
+            if NseAPI._shared_client is None:
+                pool_size = max(POOL_SIZE, max_workers)
+
+                # The transport retries failed connection attempts; _send retries rate-limited and 5xx responses.
+                transport = httpx.HTTPTransport(
+                    http2=True,
+                    retries=RETRIES,
+                    limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                )
+
+                NseAPI._shared_client = httpx.Client(
+                    headers=self.HEADERS,
+                    timeout=TIMEOUT,
+                    follow_redirects=True,
+                    transport=transport,
+                )
+
+        self.client = NseAPI._shared_client
+
+    def _prime_cookies(self, generation):
+        with NseAPI._client_lock:
+            if NseAPI._cookie_generation == generation:
+                self.client.get(COOKIE_URL, headers=self.HEADERS)
+                NseAPI._cookie_generation += 1
+
+    def _send(self, url, headers, **kwargs):
+        # Retry rate-limited, failed and dropped requests with exponential backoff, returning the last response.
+        for attempt in range(RETRIES + 1):
+            try:
+                response = self.client.get(url, headers=headers, **kwargs)
+            except RETRY_ERRORS:
+                if attempt == RETRIES:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == RETRIES:
+                    return response
+
+            time.sleep(BACKOFF_FACTOR * 2 ** attempt)
+
+    def _get(self, url, headers=None, **kwargs):
+        # NSE rejects API calls without its session cookies; fetch them only when a request is refused.
+        headers = headers or self.HEADERS
+        generation = NseAPI._cookie_generation
+        response = self._send(url, headers, **kwargs)
+
+        if response.status_code in (401, 403):
+            self._prime_cookies(generation)
+            response = self._send(url, headers, **kwargs)
+
+        return response
+
+    def cache_clear(self):
+        """
+        Clears the in-memory caches used by get_indices, get_all_stocks, index_data and index_dataframe.
+        """
+        super().cache_clear()
+
+        with self._etag_lock:
+            self._etag_cache.clear()
+
+    def _cached_get(self, url):
+        # Revalidate with the last ETag seen for the url, so unchanged payloads are neither sent nor parsed again.
+        # Only the ETAG_CACHE_SIZE most recently used urls are kept, since index payloads can be several MB.
+        with self._etag_lock:
+            cached = self._etag_cache.get(url)
+
+            if cached is not None:
+                self._etag_cache.move_to_end(url)
+        headers = self.HEADERS if cached is None else {**self.HEADERS, "If-None-Match": cached[0]}
 
-        self.client = requests.Session()
-        self.client.get("https://www.nseindia.com/market-data/live-equity-market",headers=self.HEADERS)
+        response = self._get(url, headers=headers)
+
+        if response.status_code == 304 and cached is not None:
+            return cached[1]
+
+        if response.status_code != 200:
+            return None
+
+        data = _loads(response)
+        etag = response.headers.get("ETag")
+
+        if etag:
+            with self._etag_lock:
+                self._etag_cache[url] = (etag, data)
+                self._etag_cache.move_to_end(url)
+
+                while len(self._etag_cache) > ETAG_CACHE_SIZE:
+                    self._etag_cache.popitem(last=False)
+
+        return data
         
     def get_indices(self):
         """
         Get the indices from the NSE India API.
+
+        The result is cached in memory for metadata_ttl seconds.
         
         Returns:
             A list of indices.
+
+            None: If the data cannot be retrieved.
         """
-        response = self.client.get(
-            "https://www.nseindia.com/api/equity-master",
-            headers=self.HEADERS
-        ).json()
+        cached = self._cache_get("indices")
 
-        return [symbol for symbols in response.keys() for symbol in response[symbols]]
+        if cached is not None:
+            return cached
+
+        data = self._cached_get(INDICES_URL)
+
+        if data is None:
+            return None
+
+        return self._cache_set("indices", _parse_indices(data))
     
     def get_all_stocks(self, index: str):
         """
         Retrieves all stocks from the NSE equity-stockIndices API based on the given index.
 
+        The result is cached in memory for metadata_ttl seconds.
+
         Args:
             index (str): The index for which to retrieve the stocks.
 
         Returns:
             list: A list of dictionaries containing the stock symbol and company name of each stock.
+
+            None: If the data cannot be retrieved.
         """
-        url = f"https://www.nseindia.com/api/equity-stockIndices?index={quote(index.upper())}"
+        key = ("all_stocks", index.upper())
+        cached = self._cache_get(key)
 
-        response = self.client.get(url, headers=self.HEADERS).json()['data']
+        if cached is not None:
+            return cached
 
-        results = [
-            {
-                "stock_symbol": stock['symbol'],
-                "company_name": stock.get('meta', {}).get('companyName')
-            }
-            for stock in response
-            if stock['symbol'] != index.upper()
-        ]
-        
-        return results
+        data = self._cached_get(_index_url(index))
+
+        if data is None:
+            return None
+
+        return self._cache_set(key, _parse_all_stocks(data, index))
 
     def index_data(self, stock_index):
         """
@@ -79,42 +481,58 @@ class NseAPI:
 
             None: If the response status code is not 200.
         """
-        url = f"https://www.nseindia.com/api/equity-stockIndices?index={stock_index}"
-        response = self.client.get(url, headers=self.HEADERS)
+        data = self._cached_get(_index_url(stock_index))
 
-        if response.status_code != 200:
+        if data is None:
             return None
-        
-        j_response = response.json()
-        last_updated = j_response['timestamp']
-        result = []
-
-        for i, datum in enumerate(j_response['data']):
-            temp_dict = {
-                'symbol': datum['symbol'],
-                'open': datum['open'],
-                'dayHigh': datum['dayHigh'],
-                'dayLow': datum['dayLow'],
-                'lastPrice': datum['lastPrice'],
-                'previousClose': datum['previousClose'],
-                'change': datum['change'],
-                'pChange': datum['pChange'],
-                '52W_High': datum['yearHigh'],
-                '52W_Low': datum['yearLow'],
-                'totalTradedVolume': datum['totalTradedVolume'],
-                'totalTradedValue': datum['totalTradedValue'],
-                'perChange365d': datum['perChange365d'],
-                'perChange30d': datum['perChange30d'],
-                'last_updated_at': last_updated
-            }
-
-            if i != 0:
-                temp_dict['company_name'] = datum['meta'].get("companyName")
-
-            result.append(temp_dict)
-
-        return result
 
+        return _parse_index_data(data, stock_index)
+
+    def index_dataframe(self, stock_index):
+        """
+        Same as index_data, but returns the data as a pandas DataFrame built column-wise instead of a list of
+        dictionaries, so downstream filtering and aggregation stay vectorized.
+
+        Args:
+            stock_index (str): The stock index to index data for.
+
+        Returns:
+            pandas.DataFrame: One row per record with the same columns as the keys returned by index_data,
+            plus "company_name" (empty for the index row).
+
+            None: If the response status code is not 200.
+        """
+        data = self._cached_get(_index_url(stock_index))
+
+        if data is None:
+            return None
+
+        return _parse_index_dataframe(data, stock_index)
+
+    def snapshot(self, index):
+        """
+        Retrieves a quote for every constituent of an index with a single request.
+
+        snapshot('NIFTY 500') replaces 500 get_stock_data calls when the fields of index_data are enough,
+        at the cost of the detailed quote fields only get_stock_data provides.
+
+        Args:
+            index (str): The stock index to take the snapshot of.
+
+        Returns:
+            dict: A dictionary mapping the symbol of each constituent to its index_data record. The record of the
+            index itself is left out.
+
+            None: If the data cannot be retrieved.
+        """
+        data = self.index_data(index)
+
+        if data is None:
+            return None
+
+        index_symbol = index.upper()
+
+        return {row['symbol']: row for row in data if row['symbol'] != index_symbol}
 
     def get_stock_data(self, symbol):
         """
@@ -131,37 +549,35 @@ class NseAPI:
 
                   Returns None if the stock data cannot be retrieved.
         """
-        response = self.client.get(f"https://www.nseindia.com/api/quote-equity?symbol={symbol}", headers=self.HEADERS)
-
-        if response.status_code == 200 and response.json().get("info"):
-            result = response.json()
-            final_dict = {
-                'symbol': result['info']['symbol'],
-                'company_name': result['info']['companyName'],
-                'industry': result['info'].get('industry'),
-                'listingDate': result['metadata']['listingDate'],
-                'open_price': result['priceInfo']['open'],
-                'last_price': result['priceInfo']['lastPrice'],
-                'previous_close': result['priceInfo']['previousClose'],
-                'high_price': result['priceInfo']['intraDayHighLow']['max'],
-                'low_price': result['priceInfo']['intraDayHighLow']['min'],
-                'change': round(result['priceInfo']['change'], 2),
-                'pChange': round(result['priceInfo']['pChange'], 2),
-                '52w_high_date': result['priceInfo']['weekHighLow']['maxDate'],
-                '52w_high': result['priceInfo']['weekHighLow']['max'],
-                '52w_low_date': result['priceInfo']['weekHighLow']['minDate'],
-                '52w_low': result['priceInfo']['weekHighLow']['min'],
-                'total_traded_volume': result['preOpenMarket']['totalTradedVolume'],
-                'total_buy_quantity': result['preOpenMarket']['totalBuyQuantity'],
-                'total_sell_quantity': result['preOpenMarket']['totalSellQuantity'],
-                'last_update_time': result['metadata']['lastUpdateTime']
-            }
-
-            return final_dict
+        response = self._get(QUOTE_URL.format(symbol=symbol))
 
-        return None
+        if response.status_code != 200:
+            return None
+
+        return _parse_stock_data(_loads(response))
+
+    def get_stock_data_many(self, symbols, max_workers=None):
+        """
+        Retrieves stock data for several symbols concurrently.
+
+        Parameters:
+            symbols (list): The symbols of the stocks.
+            max_workers (int): The number of parallel requests. Defaults to the value given to the constructor.
+
+        Returns:
+            dict: A dictionary mapping each symbol to the result of get_stock_data for that symbol, in the order
+            of symbols.
+
+        Raises:
+            Exception: If any of the requests raises. The first such error is re-raised and the results of the
+            other symbols are discarded.
+        """
+        symbols = list(symbols)
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+            return dict(zip(symbols, executor.map(self.get_stock_data, symbols)))
 
-    def get_historical_data(self, symbol, start_date, end_date):
+    def get_historical_data(self, symbol, start_date, end_date, dtype_backend=None, as_python_date=False):
         """
         Retrieves historical data for a given symbol within a specified date range.
 
@@ -169,46 +585,74 @@ class NseAPI:
             symbol (str): The symbol of the stock.
             start_date (str): The start date of the historical data in the format "YYYY-MM-DD".
             end_date (str): The end date of the historical data in the format "YYYY-MM-DD".
+            dtype_backend (str): Passed to DataFrame.convert_dtypes when given, e.g. "pyarrow" for Arrow-backed
+                columns or "numpy_nullable".
+            as_python_date (bool): Return "DATE" as datetime.date objects, as older versions did, instead of
+                datetime64.
 
         Returns:
             pandas.DataFrame: The historical data as a pandas DataFrame. Columns include "DATE", "SYMBOL", "SERIES",
             "OPEN", "HIGH", "LOW", "PREV_CLOSE", "LTP", "CLOSE", "VWAP", "52W_H", "52W_L", "VOLUME", "VALUE", and
-            "NO_OF_TRADES".
+            "NO_OF_TRADES". "SYMBOL" and "SERIES" are categorical and "DATE" is datetime64.
+
+            Results are cached as Parquet files in cache_dir (30 days for windows that ended before today,
+            1 hour otherwise). Pass cache_dir=None to the constructor to disable the cache.
 
         Raises:
             Exception: If there is an error retrieving the data from the API.
         """
-        url = f'https://www.nseindia.com/api/historical/cm/equity?symbol={quote(symbol.upper())}&series=["EQ"]&from={start_date}&to={end_date}&csv=true'
-        response = self.client.get(url, headers=self.HEADERS, timeout=1000)
+        if self.cache_dir is not None:
+            cache_path = _historical_cache_path(self.cache_dir, symbol, start_date, end_date)
+            df = _read_historical_cache(cache_path, end_date)
+
+            if df is not None:
+                return _finish_historical_data(df, dtype_backend, as_python_date)
+
+        url = HISTORICAL_URL.format(symbol=quote(symbol.upper()), start_date=start_date, end_date=end_date)
+        response = self._get(url, timeout=HISTORICAL_TIMEOUT)
 
         if response.status_code == 200:
             try:
-                df = pd.read_csv(StringIO(response.text), thousands=",")
-                df.columns = [
-                    "DATE",
-                    "SERIES",
-                    "OPEN",
-                    "HIGH",
-                    "LOW",
-                    "PREV_CLOSE",
-                    "LTP",
-                    "CLOSE",
-                    "VWAP",
-                    "52W_H",
-                    "52W_L",
-                    "VOLUME",
-                    "VALUE",
-                    "NO_OF_TRADES",
-                ]
-                df.insert(0, "SYMBOL", symbol)
-                df["DATE"] = pd.to_datetime(df["DATE"], format="%d-%b-%Y").dt.date
-                df['VWAP'] = pd.to_numeric(df['VWAP'], errors='coerce')
-
-                return df
+                df = _parse_historical_data(response.content, symbol)
 
             except:
-                raise Exception(f"Error: {response.json().get('showMessage')}")
+                raise Exception(f"Error: {_loads(response).get('showMessage')}")
+
+            if self.cache_dir is not None:
+                _write_historical_cache(df, cache_path)
+
+            return _finish_historical_data(df, dtype_backend, as_python_date)
 
         else:
             print(response.text)
             return None
+
+    def get_historical_data_many(
+        self, symbols, start_date, end_date, max_workers=None, dtype_backend=None, as_python_date=False
+    ):
+        """
+        Retrieves historical data for several symbols concurrently within a specified date range.
+
+        Args:
+            symbols (list): The symbols of the stocks.
+            start_date (str): The start date of the historical data in the format "YYYY-MM-DD".
+            end_date (str): The end date of the historical data in the format "YYYY-MM-DD".
+            max_workers (int): The number of parallel requests. Defaults to the value given to the constructor.
+            dtype_backend (str): Passed on to get_historical_data.
+            as_python_date (bool): Passed on to get_historical_data.
+
+        Returns:
+            dict: A dictionary mapping each symbol to the DataFrame returned by get_historical_data for that symbol,
+            in the order of symbols.
+
+        Raises:
+            Exception: If there is an error retrieving the data from the API for any symbol. The first such error
+            is re-raised and the results of the other symbols are discarded.
+        """
+        symbols = list(symbols)
+
+        def fetch(symbol):
+            return self.get_historical_data(symbol, start_date, end_date, dtype_backend, as_python_date)
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+            return dict(zip(symbols, executor.map(fetch, symbols)))
@@ -0,0 +1,265 @@
+import asyncio
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import httpx
+import pytest
+
+import async_nse_api
+import nse_api
+from async_nse_api import AsyncNseAPI
+from nse_api import INDEX_DATA_COLUMNS, RETRIES, NseAPI
+
+
+COOKIE_PATH = "/market-data/live-equity-market"
+COOKIE = "nsit=ok"
+
+INDEX_PAYLOAD = {
+    "timestamp": "10-Jul-2023 16:00:00",
+    "data": [
+        {**dict.fromkeys(INDEX_DATA_COLUMNS, 1.0), "symbol": "NIFTY 50"},
+        {**dict.fromkeys(INDEX_DATA_COLUMNS, 2.0), "symbol": "ABC", "meta": {"companyName": "Abc Ltd"}},
+    ],
+}
+
+HISTORICAL_CSV = (
+    b"Date ,series ,OPEN ,HIGH ,LOW ,PREV. CLOSE ,ltp ,close ,vwap ,52W H ,52W L ,VOLUME ,VALUE ,No of trades \n"
+    b'10-Jul-2023,EQ,"2,500.00",2510.00,2490.00,2500.00,2505.00,2505.00,2501.50,2600.00,2000.00,"1,000",2500000.00,100\n'
+)
+
+
+def quote_payload(symbol):
+    return {
+        "info": {"symbol": symbol, "companyName": f"{symbol} Ltd", "industry": "Testing"},
+        "metadata": {"listingDate": "01-Jan-2000", "lastUpdateTime": "10-Jul-2023 16:00:00"},
+        "priceInfo": {
+            "open": 10.0,
+            "lastPrice": 11.0,
+            "previousClose": 10.0,
+            "change": 1.0,
+            "pChange": 10.0,
+            "intraDayHighLow": {"min": 9.5, "max": 11.5},
+            "weekHighLow": {"min": 5.0, "minDate": "01-Jan-2023", "max": 15.0, "maxDate": "01-Jun-2023"},
+        },
+        "preOpenMarket": {"totalTradedVolume": 100, "totalBuyQuantity": 50, "totalSellQuantity": 50},
+    }
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(nse_api, "BACKOFF_FACTOR", 0)
+    monkeypatch.setattr(async_nse_api, "BACKOFF_FACTOR", 0)
+
+
+@pytest.fixture
+def make_api(monkeypatch, tmp_path):
+    def make(handler, **kwargs):
+        monkeypatch.setattr(NseAPI, "_shared_client", httpx.Client(transport=httpx.MockTransport(handler)))
+        monkeypatch.setattr(NseAPI, "_cookie_generation", 0)
+        kwargs.setdefault("cache_dir", tmp_path)
+
+        return NseAPI(**kwargs)
+
+    return make
+
+
+def run_async(handler, scenario, **kwargs):
+    async def main():
+        async with AsyncNseAPI(transport=httpx.MockTransport(handler), **kwargs) as api:
+            return await scenario(api)
+
+    return asyncio.run(main())
+
+
+class TestETagRevalidation:
+    @staticmethod
+    def handler(seen):
+        def handle(request):
+            etag = request.headers.get("If-None-Match")
+            seen.append(etag)
+
+            if etag == '"v1"':
+                return httpx.Response(304)
+
+            return httpx.Response(200, json=INDEX_PAYLOAD, headers={"ETag": '"v1"'})
+
+        return handle
+
+    def test_304_returns_cached_payload(self, make_api):
+        seen = []
+        api = make_api(self.handler(seen))
+
+        first = api.index_data("NIFTY 50")
+        second = api.index_data("NIFTY 50")
+
+        assert seen == [None, '"v1"']
+        assert second == first
+        assert second[1]["company_name"] == "Abc Ltd"
+
+    def test_index_calls_share_one_entry(self, make_api):
+        seen = []
+        api = make_api(self.handler(seen))
+
+        api.index_data("NIFTY 50")
+        stocks = api.get_all_stocks("NIFTY 50")
+
+        assert seen == [None, '"v1"']
+        assert stocks == [{"stock_symbol": "ABC", "company_name": "Abc Ltd"}]
+
+    def test_cache_clear_drops_etags(self, make_api):
+        seen = []
+        api = make_api(self.handler(seen))
+
+        api.index_data("NIFTY 50")
+        api.cache_clear()
+        api.index_data("NIFTY 50")
+
+        assert seen == [None, None]
+
+
+class TestCookiePriming:
+    def test_concurrent_401s_prime_once(self, make_api):
+        barrier = threading.Barrier(4)
+        primes = []
+
+        def handler(request):
+            if request.url.path == COOKIE_PATH:
+                primes.append(request)
+                return httpx.Response(200, headers={"Set-Cookie": f"{COOKIE}; Path=/"})
+
+            if request.headers.get("Cookie") != COOKIE:
+                # Hold every worker until all of them have been refused.
+                barrier.wait(timeout=5)
+                return httpx.Response(401)
+
+            return httpx.Response(200, json=quote_payload(request.url.params["symbol"]))
+
+        api = make_api(handler)
+        result = api.get_stock_data_many(["A", "B", "C", "D"], max_workers=4)
+
+        assert len(primes) == 1
+        assert list(result) == ["A", "B", "C", "D"]
+        assert all(quote["symbol"] == symbol for symbol, quote in result.items())
+
+    def test_async_concurrent_401s_prime_once(self):
+        primes = []
+        barrier = asyncio.Barrier(4)
+
+        async def handler(request):
+            if request.url.path == COOKIE_PATH:
+                primes.append(request)
+                return httpx.Response(200, headers={"Set-Cookie": f"{COOKIE}; Path=/"})
+
+            if request.headers.get("Cookie") != COOKIE:
+                await asyncio.wait_for(barrier.wait(), timeout=5)
+                return httpx.Response(401)
+
+            return httpx.Response(200, json=quote_payload(request.url.params["symbol"]))
+
+        async def scenario(api):
+            # Let the cookies from __aenter__ expire.
+            api.client.cookies.clear()
+
+            return await asyncio.gather(*[api.get_stock_data(symbol) for symbol in "ABCD"])
+
+        quotes = run_async(handler, scenario, cache_dir=None)
+
+        # One prime when the context is entered, then one for the whole batch.
+        assert len(primes) == 2
+        assert [quote["symbol"] for quote in quotes] == ["A", "B", "C", "D"]
+
+
+class TestRetries:
+    @staticmethod
+    def handler(statuses, calls):
+        responses = iter(statuses)
+
+        def handle(request):
+            if request.url.path == COOKIE_PATH:
+                return httpx.Response(200)
+
+            calls.append(request)
+            status = next(responses)
+
+            if status != 200:
+                return httpx.Response(status)
+
+            return httpx.Response(200, json=quote_payload("ABC"))
+
+        return handle
+
+    def test_retries_rate_limited_and_server_errors(self, make_api):
+        calls = []
+        api = make_api(self.handler([429, 503, 200], calls))
+
+        assert api.get_stock_data("ABC")["symbol"] == "ABC"
+        assert len(calls) == 3
+
+    def test_gives_up_after_retries(self, make_api):
+        calls = []
+        api = make_api(self.handler([500] * (RETRIES + 1), calls))
+
+        assert api.get_stock_data("ABC") is None
+        assert len(calls) == RETRIES + 1
+
+    def test_async_retries_rate_limited_and_server_errors(self):
+        calls = []
+        quote = run_async(
+            self.handler([429, 502, 200], calls), lambda api: api.get_stock_data("ABC"), cache_dir=None
+        )
+
+        assert quote["symbol"] == "ABC"
+        assert len(calls) == 3
+
+
+class TestHistoricalCache:
+    @pytest.fixture
+    def api(self, make_api):
+        self.calls = []
+
+        def handler(request):
+            self.calls.append(request)
+            return httpx.Response(200, content=HISTORICAL_CSV)
+
+        return make_api(handler)
+
+    def fetch_twice(self, api, tmp_path, end, written_at):
+        end_date = end.strftime("%d-%m-%Y")
+
+        first = api.get_historical_data("ABC", "01-01-2023", end_date)
+        (cache_file,) = tmp_path.iterdir()
+        os.utime(cache_file, (written_at.timestamp(), written_at.timestamp()))
+        second = api.get_historical_data("ABC", "01-01-2023", end_date)
+
+        assert second.equals(first)
+
+        return len(self.calls) - 1
+
+    @pytest.mark.parametrize(
+        "end_days_ago, written_hours_ago, expected_requests",
+        [
+            # Written after the window closed: reused until CLOSED_WINDOW_TTL runs out.
+            (10, 48, 0),
+            (40, 31 * 24, 1),
+        ],
+    )
+    def test_closed_window(self, api, tmp_path, end_days_ago, written_hours_ago, expected_requests):
+        end = date.today() - timedelta(days=end_days_ago)
+        written_at = datetime.now() - timedelta(hours=written_hours_ago)
+
+        assert self.fetch_twice(api, tmp_path, end, written_at) == expected_requests
+
+    def test_window_cached_before_it_closed(self, api, tmp_path):
+        # Fetched yesterday during trading for a window ending yesterday, so the file may be partial.
+        end = date.today() - timedelta(days=1)
+        written_at = datetime.combine(end, datetime.min.time()).replace(hour=10)
+
+        assert self.fetch_twice(api, tmp_path, end, written_at) == 1
+
+    @pytest.mark.parametrize("written_minutes_ago, expected_requests", [(10, 0), (120, 1)])
+    def test_open_window(self, api, tmp_path, written_minutes_ago, expected_requests):
+        written_at = datetime.fromtimestamp(time.time() - written_minutes_ago * 60)
+
+        assert self.fetch_twice(api, tmp_path, date.today(), written_at) == expected_requests